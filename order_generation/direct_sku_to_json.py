@@ -35,6 +35,7 @@ from pathlib import Path
 from typing import Dict, List
 
 from merge_json_templates import merge_json_templates
+from template_cache import read_template
 
 
 ROOT = Path(__file__).resolve().parent
@@ -122,8 +123,7 @@ def generate_factory_jsons(pairs: Dict[str, int], input_name: str = "factory") -
         if not template_path.exists():
             print(f"warning: template for {sku} not found", flush=True)
             continue
-        with open(template_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = read_template(template_path)
         for product in data.get("products", []):
             product["数量/个"] = qty
         factory = data.get("cells", {}).get("B3", {}).get("value", "factory")
@@ -15,6 +15,7 @@ Usage:
     python excel_to_json_template.py                    # Launch GUI (recommended)
     python excel_to_json_template.py input_file.xlsx    # Command line mode
     python excel_to_json_template.py *.xlsx             # Process multiple files
+    python excel_to_json_template.py --bundle *.xlsx    # Write one bundle file
 
 GUI Features:
 - File selection with browse dialog
@@ -25,8 +26,12 @@ GUI Features:
 """
 
 import json
+import os
+import queue
 import re
 import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 import tkinter as tk
@@ -41,10 +46,19 @@ except ImportError:
     sys.exit(1)
 
 
+# Header cell text that marks the start of the product table
+HEADER_TOKENS = frozenset(("产品编号", "型号"))
+
+# Process umask, applied to files created through mkstemp
+UMASK = os.umask(0)
+os.umask(UMASK)
+
+
 class ExcelToJsonConverter:
     def __init__(self):
         self.root_dir = Path(__file__).resolve().parent
         self.template_dir = self.root_dir / "json_template"
+        self.bundle_path = self.root_dir / "json_template_bundle.json"
         self.images_dir = self.root_dir / "images"
         
         # Create template directory if it doesn't exist
@@ -53,6 +67,9 @@ class ExcelToJsonConverter:
         # Load accessory mapping for product names
         self.accessory_map = self._load_accessory_mapping()
         
+        # Index available product images once instead of probing per SKU
+        self._image_index = self._build_image_index()
+        
     def _load_accessory_mapping(self) -> Dict[str, Dict]:
         """Load accessory mapping to get product names"""
         mapping_path = self.root_dir / "docs" / "accessory_mapping.json"
@@ -64,20 +81,28 @@ class ExcelToJsonConverter:
             print(f"Warning: {mapping_path} not found. Product names may not be populated.")
             return {}
     
+    def _build_image_index(self) -> Dict[str, str]:
+        """Map SKU to image path, preferring products over accessories"""
+        index = {}
+        for sub in ("accessories", "products"):
+            sub_dir = self.images_dir / sub
+            if sub_dir.is_dir():
+                for img_path in sub_dir.glob("*.jpg"):
+                    index[img_path.stem] = f"order_generation/images/{sub}/{img_path.stem}.jpg"
+        return index
+    
     def _find_image_path(self, sku: str) -> Optional[str]:
         """Find image path for the given SKU"""
-        for sub in ("products", "accessories"):
-            img_path = self.images_dir / sub / f"{sku}.jpg"
-            if img_path.exists():
-                return f"order_generation/images/{sub}/{sku}.jpg"
-        return None
+        return self._image_index.get(sku)
     
-    def _get_cell_value(self, ws, row: int, col: int) -> str:
+    def _get_cell_value(self, value) -> str:
         """Get cell value as string"""
-        cell = ws.cell(row=row, column=col)
-        return str(cell.value or "").strip()
+        # Fast paths for the common empty and plain-text cells
+        if type(value) is str:
+            return value.strip()
+        return str(value).strip() if value else ""
     
-    def _extract_cells_data(self, ws) -> Dict[str, Dict[str, str]]:
+    def _extract_cells_data(self, matrix: List[tuple]) -> Dict[str, Dict[str, str]]:
         """Extract all cell data with keys and values"""
         cells = {}
         
@@ -125,7 +150,8 @@ class ExcelToJsonConverter:
         
         # Extract values for mapped cells
         for addr, info in cell_mappings.items():
-            value = self._get_cell_value(ws, info["row"], info["col"])
+            row = info["row"]
+            value = self._get_cell_value(matrix[row - 1][info["col"] - 1] if row <= len(matrix) else None)
             cells[addr] = {
                 "key": info["key"],
                 "value": value
@@ -133,89 +159,71 @@ class ExcelToJsonConverter:
         
         return cells
     
-    def _find_product_table_start(self, ws) -> int:
+    def _read_matrix(self, ws) -> List[tuple]:
+        """Read all worksheet values once as row tuples (at least 7 columns wide)"""
+        return list(ws.iter_rows(max_col=max(ws.max_column or 0, 7), values_only=True))
+    
+    def _find_product_table_start(self, matrix: List[tuple]) -> int:
         """Find the row where the product table starts"""
-        # Look for the header row containing "产品编号", "数量/个", etc.
-        for row in range(1, 20):  # Check first 20 rows
-            for col in range(1, 8):  # Check columns A-G
-                cell_value = self._get_cell_value(ws, row, col)
-                if cell_value in ("产品编号", "型号"):
+        # Look for the header row containing "产品编号" or "型号" in the first
+        # 19 rows. It normally sits in column A, so scan that column first.
+        header_rows = matrix[:19]
+        for row, values in enumerate(header_rows, 1):
+            value = values[0]
+            if isinstance(value, str) and value.strip() in HEADER_TOKENS:
+                return row
+        for row, values in enumerate(header_rows, 1):
+            for value in values[1:7]:  # Columns B-G
+                if isinstance(value, str) and value.strip() in HEADER_TOKENS:
                     return row
         return 7  # Default to row 7 if not found
     
-    def _extract_products(self, ws) -> List[Dict[str, Any]]:
+    def _extract_products(self, matrix: List[tuple]) -> List[Dict[str, Any]]:
         """Extract product data from the worksheet"""
         products = []
-        header_row = self._find_product_table_start(ws)
-        
-        # Define column mapping for product table
-        # Based on standard template: A=产品编号, B=产品图片, C=描述, D=数量/个, E=单价, G=包装方式
-        col_mapping = {
-            1: "产品编号",     # Column A
-            2: "产品图片",     # Column B  
-            3: "描述",         # Column C
-            4: "数量/个",      # Column D
-            5: "单价",         # Column E
-            7: "包装方式"      # Column G
-        }
+        header_row = self._find_product_table_start(matrix)
         
-        # Start from the row after header
-        row = header_row + 1
-        
-        while row <= ws.max_row:
-            # Get product code from column A
-            sku = self._get_cell_value(ws, row, 1)
+        # Standard template columns: A=产品编号, B=产品图片, C=描述, D=数量/个, E=单价, G=包装方式
+        for values in matrix[header_row:]:
+            sku_value, img_value, desc_value, qty_value, price_value, _, pkg_value = values[:7]
+            sku = self._get_cell_value(sku_value)
             
             # Stop if we hit an empty SKU or total row
             if not sku or sku.upper().startswith("TOTAL") or sku == "总计":
                 break
             
-            product = {}
-            
-            # Extract data for each column
-            for col, field in col_mapping.items():
-                value = self._get_cell_value(ws, row, col)
-                
-                if field == "产品编号":
-                    product[field] = value
-                elif field == "产品图片":
-                    # Try to find image path, use provided value as fallback
-                    img_path = self._find_image_path(sku)
-                    product[field] = img_path or value
-                elif field == "数量/个":
-                    # Convert to integer, default to 0
-                    try:
-                        product[field] = int(float(value)) if value else 0
-                    except ValueError:
-                        product[field] = 0
-                elif field == "单价":
-                    # Convert to float
-                    try:
-                        product[field] = float(value) if value else 0.0
-                    except ValueError:
-                        product[field] = 0.0
-                else:
-                    product[field] = value
-            
-            # Add product name from accessory mapping if available
-            if sku in self.accessory_map:
-                product["产品名称"] = self.accessory_map[sku]["name"]
-            elif "产品名称" not in product:
-                product["产品名称"] = ""  # Default empty name
+            # Quantity defaults to 0 and price to 0.0 when not numeric
+            try:
+                qty = int(float(qty_value)) if qty_value else 0
+            except (TypeError, ValueError):
+                qty = 0
+            try:
+                price = float(price_value) if price_value else 0.0
+            except (TypeError, ValueError):
+                price = 0.0
             
-            products.append(product)
-            row += 1
+            products.append({
+                "产品编号": sku,
+                # Prefer a known image path, use provided value as fallback
+                "产品图片": self._image_index.get(sku) or self._get_cell_value(img_value),
+                "描述": self._get_cell_value(desc_value),
+                "数量/个": qty,
+                "单价": price,
+                "包装方式": self._get_cell_value(pkg_value),
+                # Product name from accessory mapping if available
+                "产品名称": self.accessory_map.get(sku, {}).get("name", ""),
+            })
         
         return products
     
-    def _extract_footer(self, ws) -> Dict[str, str]:
+    def _extract_footer(self, matrix: List[tuple]) -> Dict[str, str]:
         """Extract footer information (buyer, supplier)"""
         footer = {}
         
         # Look for buyer and supplier info around row 69 (standard template)
         try:
-            buyer = self._get_cell_value(ws, 69, 2)  # B69
-            supplier = self._get_cell_value(ws, 69, 5)  # E69
+            buyer = self._get_cell_value(matrix[68][1])  # B69
+            supplier = self._get_cell_value(matrix[68][4])  # E69
             
             if buyer:
                 footer["buyer"] = buyer
@@ -226,24 +234,25 @@ class ExcelToJsonConverter:
         
         return footer
     
-    def convert_excel_to_json(self, excel_path: Path) -> List[Path]:
-        """Convert Excel file to JSON template(s)"""
+    def extract_templates(self, excel_path: Path) -> Dict[str, Dict[str, Any]]:
+        """Extract JSON template data for each unique SKU in an Excel file"""
         print(f"Processing: {excel_path}")
         
         try:
-            wb = load_workbook(excel_path, data_only=True)
-            ws = wb.active
+            wb = load_workbook(excel_path, read_only=True, data_only=True)
+            try:
+                matrix = self._read_matrix(wb.active)
+            finally:
+                wb.close()
             
             # Extract data
-            cells = self._extract_cells_data(ws)
-            products = self._extract_products(ws)
-            footer = self._extract_footer(ws)
+            cells = self._extract_cells_data(matrix)
+            products = self._extract_products(matrix)
+            footer = self._extract_footer(matrix)
             
             if not products:
                 print(f"Warning: No products found in {excel_path}")
-                return []
-            
-            generated_files = []
+                return {}
             
             # Group products by SKU to avoid duplicates
             products_by_sku = {}
@@ -257,45 +266,98 @@ class ExcelToJsonConverter:
                         existing = products_by_sku[sku]
                         existing["数量/个"] += product.get("数量/个", 0)
             
-            # Generate one JSON file per unique product SKU
-            for sku, product in products_by_sku.items():
-                # Create JSON structure
-                json_data = {
+            # One JSON structure per unique product SKU
+            return {
+                sku: {
                     "cells": cells,
                     "products": [product],
                     "footer": footer
                 }
-                
-                # Save to json_template directory
-                output_path = self.template_dir / f"{sku}.json"
-                
-                with open(output_path, "w", encoding="utf-8") as f:
-                    json.dump(json_data, f, ensure_ascii=False, indent=2)
-                
-                generated_files.append(output_path)
-                print(f"  Generated: {output_path}")
-            
-            return generated_files
+                for sku, product in products_by_sku.items()
+            }
             
         except Exception as e:
             print(f"Error processing {excel_path}: {e}")
+            return {}
+    
+    def _write_json(self, output_path: Path, json_data: Dict[str, Any]) -> Path:
+        """Atomically write JSON data to output_path"""
+        # A temp file of its own, so concurrent writers of one path never collide
+        fd, tmp_name = tempfile.mkstemp(dir=output_path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(json.dumps(json_data, ensure_ascii=False, indent=2))
+            # mkstemp creates the file owner-only; keep the usual permissions
+            os.chmod(tmp_name, 0o666 & ~UMASK)
+            os.replace(tmp_name, output_path)
+        except BaseException:
+            if os.path.exists(tmp_name):
+                os.remove(tmp_name)
+            raise
+        return output_path
+    
+    def convert_excel_to_json(self, excel_path: Path) -> List[Path]:
+        """Convert Excel file to JSON template(s)"""
+        return self.write_templates(excel_path, self.extract_templates(excel_path))
+    
+    def write_templates(self, excel_path: Path, templates: Dict[str, Dict[str, Any]]) -> List[Path]:
+        """Write the templates extracted from ``excel_path``, one file per SKU"""
+        if not templates:
             return []
+        
+        # Save one file per SKU to the json_template directory, overlapping
+        # disk writes with formatting of the next file
+        output_paths = [self.template_dir / f"{sku}.json" for sku in templates]
+        try:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                generated_files = list(executor.map(self._write_json, output_paths, templates.values()))
+        except OSError as e:
+            print(f"Error writing templates for {excel_path}: {e}")
+            return []
+        
+        for output_path in generated_files:
+            print(f"  Generated: {output_path}")
+        
+        return generated_files
     
-    def process_files(self, file_patterns: List[str]) -> None:
-        """Process multiple Excel files"""
-        total_generated = 0
+    def write_bundle(self, templates: Dict[str, Dict[str, Any]]) -> Path:
+        """Write all templates to a single bundle file keyed by SKU"""
+        bundle_path = self._write_json(self.bundle_path, templates)
+        print(f"  Generated bundle: {bundle_path} ({len(templates)} templates)")
+        return bundle_path
+    
+    def process_files(self, file_patterns: List[str], bundle: bool = False) -> None:
+        """Process multiple Excel files
         
+        With ``bundle`` set, all templates are written to a single
+        ``json_template_bundle.json`` file instead of one file per SKU.
+        """
+        files = []
         for pattern in file_patterns:
             # Handle both specific files and glob patterns
             if "*" in pattern:
-                files = list(Path(".").glob(pattern))
+                files.extend(Path(".").glob(pattern))
             else:
-                files = [Path(pattern)]
+                files.append(Path(pattern))
+        files = [f for f in files if f.suffix.lower() in (".xlsx", ".xls")]
+        
+        # Workbooks are independent, so parse them in separate processes;
+        # results are written here in input order, so the last file still
+        # wins when two workbooks contain the same SKU
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            if bundle:
+                templates = {}
+                for file_templates in executor.map(self.extract_templates, files):
+                    templates.update(file_templates)
+                if templates:
+                    self.write_bundle(templates)
+                print(f"\nTotal JSON templates bundled: {len(templates)}")
+                print(f"Output file: {self.bundle_path}")
+                return
             
-            for file_path in files:
-                if file_path.suffix.lower() in (".xlsx", ".xls"):
-                    generated = self.convert_excel_to_json(file_path)
-                    total_generated += len(generated)
+            total_generated = 0
+            for excel_path, file_templates in zip(files, executor.map(self.extract_templates, files)):
+                total_generated += len(self.write_templates(excel_path, file_templates))
         
         print(f"\nTotal JSON templates generated: {total_generated}")
         print(f"Output directory: {self.template_dir}")
@@ -313,11 +375,18 @@ class ExcelToJsonGUI:
         # Selected files list
         self.selected_files = []
         
+        # Log lines queued from any thread, flushed to the text widget in batches
+        self._log_queue = queue.Queue()
+        
         # Create GUI
         self._create_widgets()
+        self.root.after(50, self._drain_log_queue)
         
     def _create_widgets(self):
         """Create all GUI widgets"""
+        # Widgets disabled while a conversion is running
+        self._interactive_widgets: List[tk.Widget] = []
+        
         # Main frame
         main_frame = ttk.Frame(self.root, padding="10")
         main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
@@ -342,12 +411,12 @@ class ExcelToJsonGUI:
         button_frame = ttk.Frame(file_frame)
         button_frame.grid(row=0, column=0, sticky=(tk.W, tk.E), pady=(0, 10))
         
-        ttk.Button(button_frame, text="Select Excel Files", 
-                  command=self._select_files).pack(side=tk.LEFT, padx=(0, 10))
-        ttk.Button(button_frame, text="Add Folder", 
-                  command=self._select_folder).pack(side=tk.LEFT, padx=(0, 10))
-        ttk.Button(button_frame, text="Clear All", 
-                  command=self._clear_files).pack(side=tk.LEFT, padx=(0, 10))
+        for text, command in (("Select Excel Files", self._select_files),
+                              ("Add Folder", self._select_folder),
+                              ("Clear All", self._clear_files)):
+            button = ttk.Button(button_frame, text=text, command=command)
+            button.pack(side=tk.LEFT, padx=(0, 10))
+            self._interactive_widgets.append(button)
         
         # File list
         list_frame = ttk.Frame(file_frame)
@@ -362,15 +431,25 @@ class ExcelToJsonGUI:
         
         self.file_listbox.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         file_scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        self._interactive_widgets.append(self.file_listbox)
         
         # Control buttons
         control_frame = ttk.Frame(file_frame)
         control_frame.grid(row=2, column=0, sticky=(tk.W, tk.E), pady=(10, 0))
         
-        ttk.Button(control_frame, text="Remove Selected", 
-                  command=self._remove_selected).pack(side=tk.LEFT, padx=(0, 10))
-        ttk.Button(control_frame, text="Convert to JSON", 
-                  command=self._convert_files).pack(side=tk.LEFT, padx=(20, 0))
+        remove_button = ttk.Button(control_frame, text="Remove Selected", 
+                                   command=self._remove_selected)
+        remove_button.pack(side=tk.LEFT, padx=(0, 10))
+        convert_button = ttk.Button(control_frame, text="Convert to JSON", 
+                                    command=self._convert_files)
+        convert_button.pack(side=tk.LEFT, padx=(20, 0))
+        
+        # Bundle mode writes one file instead of one file per SKU
+        self.bundle_var = tk.BooleanVar(value=False)
+        bundle_check = ttk.Checkbutton(control_frame, text="Single bundle file", 
+                                       variable=self.bundle_var)
+        bundle_check.pack(side=tk.LEFT, padx=(20, 0))
+        self._interactive_widgets.extend((remove_button, convert_button, bundle_check))
         
         # Progress and output section
         output_frame = ttk.LabelFrame(main_frame, text="Conversion Progress", padding="10")
@@ -402,9 +481,20 @@ class ExcelToJsonGUI:
         
     def _log(self, message: str):
         """Log a message to the output text"""
-        self.output_text.insert(tk.END, message + "\n")
-        self.output_text.see(tk.END)
-        self.root.update()
+        self._log_queue.put(message)
+    
+    def _drain_log_queue(self):
+        """Insert all pending log messages in one call (runs on the Tk thread)"""
+        batch = []
+        while True:
+            try:
+                batch.append(self._log_queue.get_nowait())
+            except queue.Empty:
+                break
+        if batch:
+            self.output_text.insert(tk.END, "\n".join(batch) + "\n")
+            self.output_text.see(tk.END)
+        self.root.after(50, self._drain_log_queue)
         
     def _select_files(self):
         """Select Excel files to convert"""
@@ -471,63 +561,70 @@ class ExcelToJsonGUI:
             messagebox.showwarning("Warning", "Please select Excel files to convert")
             return
         
-        # Disable convert button during processing
-        for child in self.root.winfo_children():
-            self._disable_widgets(child)
+        # Disable controls during processing (the log stays writable)
+        self._set_widgets_state('disabled')
         
         # Start conversion in background thread
         thread = threading.Thread(target=self._conversion_worker)
         thread.daemon = True
         thread.start()
     
-    def _disable_widgets(self, widget):
-        """Recursively disable all widgets"""
-        try:
-            widget.configure(state='disabled')
-        except:
-            pass
-        for child in widget.winfo_children():
-            self._disable_widgets(child)
+    def _set_widgets_state(self, state: str):
+        """Enable or disable the interactive widgets"""
+        for widget in self._interactive_widgets:
+            widget.configure(state=state)
     
-    def _enable_widgets(self, widget):
-        """Recursively enable all widgets"""
-        try:
-            widget.configure(state='normal')
-        except:
-            pass
-        for child in widget.winfo_children():
-            self._enable_widgets(child)
+    def _set_progress(self, value: int, text: str):
+        """Update progress bar and label (runs on the Tk thread)"""
+        self.progress_bar.configure(value=value)
+        self.progress_var.set(text)
     
     def _conversion_worker(self):
         """Background worker for file conversion"""
         try:
             total_files = len(self.selected_files)
             total_generated = 0
+            bundle = self.bundle_var.get()
+            bundle_templates = {}
             
-            self.progress_bar.configure(maximum=total_files)
+            self.root.after(0, self.progress_bar.configure, {"maximum": total_files})
             
-            for i, file_path in enumerate(self.selected_files):
-                self.progress_var.set(f"Processing {i+1}/{total_files}: {Path(file_path).name}")
-                self.progress_bar.configure(value=i)
-                
-                self._log(f"\n[{i+1}/{total_files}] Processing: {Path(file_path).name}")
+            # Parse all files in worker processes; results are written and
+            # reported here in input order
+            with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+                futures = [executor.submit(self.converter.extract_templates, Path(file_path))
+                           for file_path in self.selected_files]
                 
-                try:
-                    generated_files = self.converter.convert_excel_to_json(Path(file_path))
-                    total_generated += len(generated_files)
+                for i, (file_path, future) in enumerate(zip(self.selected_files, futures)):
+                    self.root.after(0, self._set_progress, i, f"Processing {i+1}/{total_files}: {Path(file_path).name}")
                     
-                    if generated_files:
-                        self._log(f"  ✓ Generated {len(generated_files)} JSON template(s)")
-                        for json_file in generated_files:
-                            self._log(f"    - {json_file.name}")
-                    else:
-                        self._log(f"  ⚠ No templates generated (no products found)")
+                    self._log(f"\n[{i+1}/{total_files}] Processing: {Path(file_path).name}")
+                    
+                    try:
+                        templates = future.result()
+                        if bundle:
+                            bundle_templates.update(templates)
+                            generated_names = [f"{sku}.json" for sku in templates]
+                        else:
+                            generated = self.converter.write_templates(Path(file_path), templates)
+                            generated_names = [json_file.name for json_file in generated]
+                        total_generated += len(generated_names)
                         
-                except Exception as e:
-                    self._log(f"  ✗ Error: {e}")
+                        if generated_names:
+                            self._log(f"  ✓ Generated {len(generated_names)} JSON template(s)")
+                            for name in generated_names:
+                                self._log(f"    - {name}")
+                        else:
+                            self._log(f"  ⚠ No templates generated (no products found)")
+                            
+                    except Exception as e:
+                        self._log(f"  ✗ Error: {e}")
+            
+            if bundle_templates:
+                self.converter.write_bundle(bundle_templates)
+            output_location = self.converter.bundle_path if bundle else self.converter.template_dir
             
-            self.progress_bar.configure(value=total_files)
-            self.progress_var.set("Conversion completed!")
+            self.root.after(0, self._set_progress, total_files, "Conversion completed!")
             
             # Summary
             self._log(f"\n" + "="*50)
@@ -535,7 +632,7 @@ class ExcelToJsonGUI:
             self._log(f"="*50)
             self._log(f"Files processed: {total_files}")
             self._log(f"JSON templates generated: {total_generated}")
-            self._log(f"Output directory: {self.converter.template_dir}")
+            self._log(f"Output: {output_location}")
             self._log(f"="*50)
             
             if total_generated > 0:
@@ -543,7 +640,7 @@ class ExcelToJsonGUI:
                     f"Conversion completed!\n\n"
                     f"Files processed: {total_files}\n"
                     f"JSON templates generated: {total_generated}\n"
-                    f"Output directory: {self.converter.template_dir}")
+                    f"Output: {output_location}")
             else:
                 messagebox.showwarning("Warning", 
                     f"Conversion completed but no JSON templates were generated.\n"
@@ -558,8 +655,7 @@ class ExcelToJsonGUI:
         
         finally:
             # Re-enable widgets
-            for child in self.root.winfo_children():
-                self._enable_widgets(child)
+            self.root.after(0, self._set_widgets_state, 'normal')
 
 
 def main():
@@ -579,10 +675,13 @@ def main():
         # Command line arguments provided - use CLI mode
         print("Usage: python excel_to_json_template.py <excel_file1> [excel_file2] ...")
         print("       python excel_to_json_template.py *.xlsx")
+        print("       python excel_to_json_template.py --bundle *.xlsx")
         print("       python excel_to_json_template.py  # Launch GUI")
         
+        args = sys.argv[1:]
+        bundle = "--bundle" in args
         converter = ExcelToJsonConverter()
-        converter.process_files(sys.argv[1:])
+        converter.process_files([arg for arg in args if arg != "--bundle"], bundle=bundle)
 
 
 if __name__ == "__main__":
@@ -17,7 +17,8 @@ def read_rows(xlsx: str):
             root = ET.fromstring(z.read('xl/sharedStrings.xml'))
             for si in root.findall('.//' + NAMESPACE + 'si'):
                 text = ''.join(t.text or '' for t in si.findall('.//' + NAMESPACE + 't'))
-                shared.append(text)
+                # Cells repeating the same shared string get the same object
+                shared.append(sys.intern(text))
         sheet_root = ET.fromstring(z.read('xl/worksheets/sheet1.xml'))
         rows_maps = []
         max_col = 0
@@ -56,7 +57,7 @@ def build_mapping(xlsx: str) -> Dict[str, Any]:
     rows = read_rows(xlsx)
     if not rows:
         return {"parents": {}}
-    header = rows[0]
+    header = [sys.intern(name) for name in rows[0]]
     sku_idx = header.index('SKU')
     parent_asin_idx = header.index('父ASIN')
     name_idx = header.index('品名') if '品名' in header else None
@@ -1,16 +1,30 @@
 import sys
-import json
 import re
 from datetime import datetime, timedelta
+from functools import lru_cache
+from io import BytesIO
 from pathlib import Path
+from typing import Dict, Optional
 
 try:
     from openpyxl import load_workbook
     from openpyxl.drawing.image import Image
+    from openpyxl.utils import column_index_from_string, coordinate_to_tuple
 except ModuleNotFoundError as exc:  # pragma: no cover - dependency missing in tests
     raise SystemExit("openpyxl and pillow are required to run this script") from exc
 
+try:
+    import json_stream
+except ImportError:  # optional: fall back to parsing whole files
+    json_stream = None
+
+from template_cache import loads_json
+
 PRODUCT_START_ROW = 7
+# Order files larger than this are streamed (json_stream) instead of parsed whole
+STREAM_THRESHOLD = 1 << 20
+# Later sections overwrite cells written by earlier ones
+SECTION_ORDER = ('cells', 'products', 'footer')
 COLUMN_MAP = {
     '产品编号': 'A',
     '产品图片': 'B',
@@ -19,61 +33,123 @@ COLUMN_MAP = {
     '单价': 'E',
     '包装方式': 'G',
 }
+# (key, column letter, column index) resolved once for the product loop
+PRODUCT_COLUMNS = [(key, col, column_index_from_string(col)) for key, col in COLUMN_MAP.items()]
+AMOUNT_COLUMN = column_index_from_string('F')
 
+# First run of digits in a delivery time such as "15天"
+_NUM_RE = re.compile(r'\d+')
+
+# Header cell addresses repeat across every template, so parse each A1 string once
+_cell_position = lru_cache(maxsize=None)(coordinate_to_tuple)
+
+# Template file contents, read once per process and re-parsed per workbook
+_TEMPLATE_BYTES: Dict[Path, bytes] = {}
+
+
+def template_bytes(template: Path) -> bytes:
+    """Return the contents of ``template``, reading the file only once."""
+    raw = _TEMPLATE_BYTES.get(template)
+    if raw is None:
+        raw = _TEMPLATE_BYTES[template] = template.read_bytes()
+    return raw
+
+
+def load_template(template: Path):
+    """Return a fresh workbook parsed from the cached bytes of ``template``."""
+    return load_workbook(BytesIO(template_bytes(template)))
+
+
+# SKU -> image file for each images folder, listed once per process
+_IMAGE_INDEX: Dict[Path, Dict[str, Path]] = {}
+# Product image file contents, shared by all workbooks filled in this process
+_IMAGE_BYTES: Dict[Path, bytes] = {}
+
+
+def _image_index(images_dir: Path) -> Dict[str, Path]:
+    """Return SKU -> image path under ``images_dir``, products before accessories."""
+    index = _IMAGE_INDEX.get(images_dir)
+    if index is None:
+        index = {}
+        for sub in ('accessories', 'products'):
+            sub_dir = images_dir / sub
+            if sub_dir.is_dir():
+                index.update((img_path.stem, img_path) for img_path in sub_dir.glob('*.jpg'))
+        _IMAGE_INDEX[images_dir] = index
+    return index
+
+
+def _product_image_bytes(images_dir: Path, sku: str) -> Optional[bytes]:
+    """Return the image for ``sku`` from products/ or accessories/, or None."""
+    img_path = _image_index(images_dir).get(sku)
+    if img_path is None:
+        return None
+    raw = _IMAGE_BYTES.get(img_path)
+    if raw is None:
+        raw = _IMAGE_BYTES[img_path] = img_path.read_bytes()
+    return raw
+
+
+def _materialize(value):
+    """Return ``value`` as plain dicts/lists, consuming a streamed section."""
+    if json_stream is None or isinstance(value, (dict, list)):
+        return value
+    return json_stream.to_standard_types(value)
 
-def fill_workbook(template: Path, data: dict, json_filename: str = ""):
-    """Return workbook filled with ``data`` using ``template``."""
-    wb = load_workbook(template)
-    ws = wb.active
 
-    for addr, info in data.get('cells', {}).items():
+def _fill_cells(ws, cells, json_filename: str = ""):
+    """Write the ``cells`` section of an order into ``ws``."""
+    # One timestamp for the whole order so all dates agree
+    now = datetime.now()
+    for addr, info in cells.items():
+        info = _materialize(info)
         value = info.get('value', '')
         key = info.get('key', '')
         
         # Handle special date fields
         if key == '日期':
             # Fill with today's date
-            value = datetime.now().strftime('%Y年%m月%d日')
+            value = now.strftime('%Y年%m月%d日')
         elif key == '交货时间' or key == '交货日期':
             # Extract number from the original value and add to today's date
             original_value = str(value)
             # Look for numbers in the value (could be "15天", "30", "45", etc.)
-            numbers = re.findall(r'\d+', original_value)
-            if numbers:
-                days_to_add = int(numbers[0])
-                delivery_date = datetime.now() + timedelta(days=days_to_add)
+            match = _NUM_RE.search(original_value)
+            if match:
+                days_to_add = int(match.group())
+                delivery_date = now + timedelta(days=days_to_add)
                 value = delivery_date.strftime('%Y年%m月%d日')
             else:
                 # If no number found, default to 30 days from today
-                delivery_date = datetime.now() + timedelta(days=30)
+                delivery_date = now + timedelta(days=30)
                 value = delivery_date.strftime('%Y年%m月%d日')
         elif key == '订单号' and not value and json_filename:
             # Extract order number from filename (e.g., "factory-1.json" -> "factory-1")
             order_number = Path(json_filename).stem
             value = order_number
         
-        ws[addr] = value
+        row, col = _cell_position(addr)
+        ws.cell(row=row, column=col, value=value)
 
-    from PIL import Image as PILImage
-    row = PRODUCT_START_ROW
-    for product in data.get('products', []):
-        for key, col in COLUMN_MAP.items():
+
+def _fill_products(ws, template: Path, products):
+    """Write product rows into ``ws``, one row per product as it is read."""
+    for row, product in enumerate(products, PRODUCT_START_ROW):
+        product = _materialize(product)
+        for key, col, col_idx in PRODUCT_COLUMNS:
             if key in product:
                 if key == '产品图片':
                     # Use SKU (产品编号) to construct image path, check multiple directories
                     sku = product.get('产品编号', '')
                     # Try products directory first, then accessories directory
-                    img_path = template.parent.parent / 'images' / 'products' / f'{sku}.jpg'
-                    if not img_path.exists():
-                        img_path = template.parent.parent / 'images' / 'accessories' / f'{sku}.jpg'
+                    img_bytes = _product_image_bytes(template.parent.parent / 'images', sku)
                     
-                    if img_path.exists():
+                    if img_bytes is not None:
                         try:
-                            # Verify image can be opened by Pillow and get size
-                            with PILImage.open(img_path) as pil_img:
-                                pil_img.verify()
-                                orig_width, orig_height = pil_img.size
-                            img = Image(str(img_path))
+                            # openpyxl reads the size with Pillow and embeds the
+                            # same bytes on save; each image needs its own stream
+                            img = Image(BytesIO(img_bytes))
+                            orig_width, orig_height = img.width, img.height
                             # Set row height to 100
                             ws.row_dimensions[row].height = 100
                             # openpyxl row height is in points (1 point = 1/72 inch),
@@ -85,25 +161,88 @@ def fill_workbook(template: Path, data: dict, json_filename: str = ""):
                             img.width = int(orig_width * scale)
                             ws.add_image(img, f"{col}{row}")
                         except Exception as e:
-                            ws[f"{col}{row}"] = f"[图片错误] {product[key]}: {e}"
+                            ws.cell(row=row, column=col_idx, value=f"[图片错误] {product[key]}: {e}")
                     else:
-                        ws[f"{col}{row}"] = f"[图片未找到] {product[key]}"
+                        ws.cell(row=row, column=col_idx, value=f"[图片未找到] {product[key]}")
                 else:
-                    ws[f"{col}{row}"] = product[key]
+                    ws.cell(row=row, column=col_idx, value=product[key])
         qty = product.get('数量/个')
         price = product.get('单价')
         if qty not in (None, '') and price not in (None, ''):
-            ws[f"F{row}"] = f"=D{row}*E{row}"
-        row += 1
+            ws.cell(row=row, column=AMOUNT_COLUMN, value=f"=D{row}*E{row}")
+
 
-    footer = data.get('footer', {})
+def _fill_footer(ws, footer):
+    """Write buyer and supplier from the ``footer`` section into ``ws``."""
+    footer = _materialize(footer)
     if 'buyer' in footer:
         ws['B69'] = footer['buyer']
     if 'supplier' in footer:
         ws['E69'] = footer['supplier']
+
+
+def _ordered_sections(data):
+    """Yield the ``(section, content)`` pairs of ``data`` in ``SECTION_ORDER``.
+
+    A ``json_stream`` document is still read once: a section that arrives
+    ahead of its turn is materialized and applied when its turn comes."""
+    if isinstance(data, dict):
+        for section in SECTION_ORDER:
+            if section in data:
+                yield section, data[section]
+        return
+
+    pending = {}
+    applied = 0
+    for section, content in data.items():
+        if section not in SECTION_ORDER:
+            continue
+        if section != SECTION_ORDER[applied]:
+            pending[section] = _materialize(content)
+            continue
+        yield section, content
+        applied += 1
+        while applied < len(SECTION_ORDER) and SECTION_ORDER[applied] in pending:
+            yield SECTION_ORDER[applied], pending.pop(SECTION_ORDER[applied])
+            applied += 1
+    for section in SECTION_ORDER:
+        if section in pending:
+            yield section, pending[section]
+
+
+def fill_workbook(template: Path, data: dict, json_filename: str = ""):
+    """Return workbook filled with ``data`` using ``template``.
+
+    ``data`` may be a plain dict or a transient ``json_stream`` document;
+    either way sections are applied cells, then products, then footer."""
+    wb = load_template(template)
+    ws = wb.active
+
+    for section, content in _ordered_sections(data):
+        if section == 'cells':
+            _fill_cells(ws, content, json_filename)
+        elif section == 'products':
+            _fill_products(ws, template, content)
+        else:
+            _fill_footer(ws, content)
     return wb
 
 
+def json_to_excel(json_path: Path, out_path: Path, template: Path) -> None:
+    """Fill ``template`` from the order file ``json_path`` and save to ``out_path``.
+
+    Large files are streamed with ``json_stream`` when installed so products
+    are written while the file is parsed; other files are parsed in one go
+    with :func:`template_cache.loads_json`."""
+    if json_stream is not None and json_path.stat().st_size > STREAM_THRESHOLD:
+        with open(json_path, 'r', encoding='utf-8') as f:
+            wb = fill_workbook(template, json_stream.load(f), json_path.name)
+    else:
+        data = loads_json(json_path.read_bytes())
+        wb = fill_workbook(template, data, json_path.name)
+    wb.save(out_path)
+
+
 def main(argv: list[str]) -> int:
     if len(argv) != 3:
         print("usage: json_PO_excel.py <input.json> <output.xlsx>")
@@ -113,11 +252,7 @@ def main(argv: list[str]) -> int:
     out_path = Path(argv[2])
     template = Path(__file__).resolve().parent / 'docs' / 'empty_base_template.xlsx'
 
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-
-    wb = fill_workbook(template, data, json_path.name)
-    wb.save(out_path)
+    json_to_excel(json_path, out_path, template)
     return 0
 
 
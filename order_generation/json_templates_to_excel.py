@@ -7,7 +7,8 @@ to Excel files in the format of empty_base_template.xlsx and saves them
 under the PO_excel directory.
 
 The script uses the existing json_PO_excel.py functionality to ensure
-consistency with the current order generation system.
+consistency with the current order generation system. Templates are
+converted in-process, spread across worker processes for batch runs.
 
 Usage:
     python json_templates_to_excel.py
@@ -15,10 +16,13 @@ Usage:
 """
 
 import argparse
-import subprocess
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import List, Union
+
+from json_PO_excel import json_to_excel, template_bytes
 
 
 class JsonTemplateToExcelConverter:
@@ -26,47 +30,47 @@ class JsonTemplateToExcelConverter:
         self.root_dir = Path(__file__).resolve().parent
         self.template_dir = self.root_dir / "json_template"
         self.output_dir = self.root_dir / output_dir
-        self.json_po_excel_script = self.root_dir / "json_PO_excel.py"
+        self.excel_template = self.root_dir / "docs" / "empty_base_template.xlsx"
         
         # Create output directory if it doesn't exist
         self.output_dir.mkdir(exist_ok=True)
         
-        # Verify json_PO_excel.py exists
-        if not self.json_po_excel_script.exists():
-            raise FileNotFoundError(f"Required script not found: {self.json_po_excel_script}")
+        # Verify the Excel template exists
+        if not self.excel_template.exists():
+            raise FileNotFoundError(f"Required template not found: {self.excel_template}")
     
     def get_json_templates(self) -> List[Path]:
         """Get all JSON template files"""
         if not self.template_dir.exists():
             raise FileNotFoundError(f"Template directory not found: {self.template_dir}")
         
-        json_files = list(self.template_dir.glob("*.json"))
-        return sorted(json_files)
+        # Filter and sort plain names from one directory scan, then build paths
+        with os.scandir(self.template_dir) as entries:
+            names = sorted(entry.name for entry in entries
+                           if entry.name.endswith(".json") and entry.is_file())
+        return [self.template_dir / name for name in names]
     
     def convert_json_to_excel(self, json_path: Path) -> Path:
-        """Convert a single JSON template to Excel using json_PO_excel.py"""
+        """Convert a single JSON template to Excel using json_PO_excel.json_to_excel"""
         # Generate output Excel filename based on JSON filename
         excel_filename = json_path.stem + ".xlsx"
         excel_path = self.output_dir / excel_filename
         
         try:
-            # Run json_PO_excel.py as subprocess
-            result = subprocess.run([
-                sys.executable, str(self.json_po_excel_script),
-                str(json_path), str(excel_path)
-            ], check=True, capture_output=True, text=True)
-            
+            json_to_excel(json_path, excel_path, self.excel_template)
             return excel_path
             
-        except subprocess.CalledProcessError as e:
-            print(f"Error converting {json_path.name}: {e}")
-            print(f"stdout: {e.stdout}")
-            print(f"stderr: {e.stderr}")
-            raise
         except Exception as e:
             print(f"Unexpected error converting {json_path.name}: {e}")
             raise
     
+    def _convert_or_error(self, json_path: Path) -> Union[Path, Exception]:
+        """Convert one template, returning the error instead of raising it"""
+        try:
+            return self.convert_json_to_excel(json_path)
+        except Exception as e:
+            return e
+    
     def convert_all_templates(self) -> List[Path]:
         """Convert all JSON templates to Excel files"""
         json_files = self.get_json_templates()
@@ -82,15 +86,19 @@ class JsonTemplateToExcelConverter:
         converted_files = []
         failed_files = []
         
-        for json_path in json_files:
-            try:
-                excel_path = self.convert_json_to_excel(json_path)
-                converted_files.append(excel_path)
-                print(f"✓ {json_path.name} -> {excel_path.name}")
-                
-            except Exception as e:
-                failed_files.append(json_path)
-                print(f"✗ {json_path.name} -> FAILED: {e}")
+        # Each worker process imports openpyxl and reads the Excel template once,
+        # then converts files handed out in small chunks to amortize IPC
+        with ProcessPoolExecutor(max_workers=os.cpu_count(), initializer=template_bytes,
+                                 initargs=(self.excel_template,)) as executor:
+            results = executor.map(self._convert_or_error, json_files, chunksize=4)
+            
+            for json_path, result in zip(json_files, results):
+                if isinstance(result, Exception):
+                    failed_files.append(json_path)
+                    print(f"✗ {json_path.name} -> FAILED: {result}")
+                else:
+                    converted_files.append(result)
+                    print(f"✓ {json_path.name} -> {result.name}")
         
         # Print summary
         print("-" * 50)
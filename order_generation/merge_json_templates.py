@@ -1,8 +1,16 @@
-import json
+import os
+import shutil
 import sys
+import tempfile
 from pathlib import Path
 from typing import Any, Dict, List
 
+from template_cache import dumps_json, loads_json
+
+# Process umask, applied to files created through mkstemp
+UMASK = os.umask(0)
+os.umask(UMASK)
+
 
 def _select_cell(existing: Dict[str, Any], new: Dict[str, Any], addr: str) -> Dict[str, Any]:
     """Return preferred cell info between ``existing`` and ``new``.
@@ -22,6 +30,21 @@ def _select_cell(existing: Dict[str, Any], new: Dict[str, Any], addr: str) -> Di
     return existing
 
 
+def _merge_sections(cells: Dict[str, Any], footer: Dict[str, Any], data: Dict[str, Any]) -> None:
+    """Merge the ``cells`` and ``footer`` of ``data`` into the accumulated ones."""
+    for addr, info in data.get("cells", {}).items():
+        existing = cells.get(addr)
+        # Fast path: first writer wins without a _select_cell call
+        if not existing or not existing.get("value"):
+            cells[addr] = info
+        else:
+            cells[addr] = _select_cell(existing, info, addr)
+
+    for key, value in data.get("footer", {}).items():
+        if key not in footer or not footer[key]:
+            footer[key] = value
+
+
 def merge_json_templates(paths: List[Path]) -> Dict[str, Any]:
     """Merge product JSON templates for a single factory.
 
@@ -32,29 +55,80 @@ def merge_json_templates(paths: List[Path]) -> Dict[str, Any]:
     if not paths:
         raise ValueError("at least one input path is required")
 
-    with open(paths[0], "r", encoding="utf-8") as f:
-        merged: Dict[str, Any] = json.load(f)
+    merged: Dict[str, Any] = loads_json(Path(paths[0]).read_bytes())
 
     merged.setdefault("products", [])
     merged.setdefault("cells", {})
     merged.setdefault("footer", {})
 
     for path in paths[1:]:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = loads_json(Path(path).read_bytes())
 
         merged["products"].extend(data.get("products", []))
+        _merge_sections(merged["cells"], merged["footer"], data)
 
-        cells = data.get("cells", {})
-        for addr, info in cells.items():
-            merged["cells"][addr] = _select_cell(merged["cells"].get(addr), info, addr)
+    return merged
 
-        footer = data.get("footer", {})
-        for key, value in footer.items():
-            if key not in merged["footer"] or not merged["footer"][key]:
-                merged["footer"][key] = value
 
-    return merged
+def merge_stream(paths: List[Path], out_path: Path) -> None:
+    """Merge templates like :func:`merge_json_templates` straight into ``out_path``.
+
+    Products are spooled to a temporary file as each input is parsed, so only
+    one input file and the merged ``cells`` and ``footer`` are held in memory
+    at a time. Sections are written in the first file's key order, and
+    ``out_path`` is only replaced once every input has been merged.
+    """
+    if not paths:
+        raise ValueError("at least one input path is required")
+
+    out_path = Path(out_path)
+    base: Dict[str, Any] = {}
+    cells: Dict[str, Any] = {}
+    footer: Dict[str, Any] = {}
+    separator = b""
+
+    with tempfile.TemporaryFile() as spool:
+        for index, path in enumerate(paths):
+            data = loads_json(Path(path).read_bytes())
+
+            for product in data.get("products") or []:
+                spool.write(separator + dumps_json(product))
+                separator = b",\n"
+
+            if index == 0:
+                # The first file is the base, as in merge_json_templates
+                base = data
+                cells = data.get("cells") or {}
+                footer = data.get("footer") or {}
+            else:
+                _merge_sections(cells, footer, data)
+
+        keys = list(base) + [k for k in ("products", "cells", "footer") if k not in base]
+        fd, tmp_name = tempfile.mkstemp(dir=out_path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(b"{")
+                for i, key in enumerate(keys):
+                    f.write((b",\n" if i else b"\n") + dumps_json(key) + b": ")
+                    if key == "products":
+                        f.write(b"[\n")
+                        spool.seek(0)
+                        shutil.copyfileobj(spool, f)
+                        f.write(b"\n]")
+                    elif key == "cells":
+                        f.write(dumps_json(cells))
+                    elif key == "footer":
+                        f.write(dumps_json(footer))
+                    else:
+                        f.write(dumps_json(base[key]))
+                f.write(b"\n}\n")
+            # mkstemp creates the file owner-only; keep the usual permissions
+            os.chmod(tmp_name, 0o666 & ~UMASK)
+            os.replace(tmp_name, out_path)
+        except BaseException:
+            if os.path.exists(tmp_name):
+                os.remove(tmp_name)
+            raise
 
 
 def main(argv: List[str]) -> int:
@@ -67,10 +141,7 @@ def main(argv: List[str]) -> int:
     out_path = Path(argv[1])
     in_paths = [Path(p) for p in argv[2:]]
 
-    merged = merge_json_templates(in_paths)
-
-    with open(out_path, "w", encoding="utf-8") as f:
-        json.dump(merged, f, ensure_ascii=False, indent=2)
+    merge_stream(in_paths, out_path)
 
     return 0
 
@@ -12,59 +12,150 @@ Features:
 - Copy command to clipboard for easy execution
 """
 
-import json
+import heapq
+import os
+import shlex
+import threading
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
 import subprocess
 import sys
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List
 import pyperclip  # For clipboard functionality
 
+from template_cache import get_all_products
+
+# Number of (search type, query) results kept for retyped queries
+SUGGESTION_CACHE_SIZE = 128
+
+
+class SubstringIndex:
+    """Suffix trie mapping every substring of the keys to the indices containing it"""
+    
+    # Suffixes are truncated to this length to bound memory; longer queries scan
+    MAX_DEPTH = 32
+    
+    def __init__(self, keys: List[str]):
+        self.keys = keys
+        # Each node is (children, indices of keys containing the path to this node)
+        self.root = ({}, set(range(len(keys))))
+        for idx, key in enumerate(keys):
+            for start in range(len(key)):
+                node = self.root
+                for ch in key[start:start + self.MAX_DEPTH]:
+                    child = node[0].get(ch)
+                    if child is None:
+                        child = node[0][ch] = ({}, set())
+                    child[1].add(idx)
+                    node = child
+        # Last walked query and its node, reused while the user keeps typing
+        self._last = ("", self.root)
+    
+    def search(self, query: str, limit: int = 20) -> List[int]:
+        """Return up to ``limit`` key indices containing ``query``, in key order"""
+        if len(query) > self.MAX_DEPTH:
+            return [i for i, key in enumerate(self.keys) if query in key][:limit]
+        
+        last_query, node = self._last
+        if not query.startswith(last_query):
+            last_query, node = "", self.root
+        for ch in query[len(last_query):]:
+            node = node[0].get(ch)
+            if node is None:
+                return []
+        self._last = (query, node)
+        return heapq.nsmallest(limit, node[1])
+
+
 class ProductSearchGUI:
     def __init__(self, root):
         self.root = root
         self.root.title("Amazon Order Product Search")
         self.root.geometry("1000x800")
         
-        # Load product data
-        self.products = self._load_products()
+        # Start with an empty catalog so the window appears right away; the
+        # templates are loaded on a worker thread and installed when ready
+        self._install_catalog([], SubstringIndex([]), SubstringIndex([]))
         
         # Initialize product pool/cart
         self.product_pool = {}  # {sku: {'product': product_dict, 'quantity': int, 'warehouse': str}}
+        # Pool rows are keyed by SKU in the tree; totals are kept per row
+        self._pool_row_totals = {}  # {sku: total_price}
+        self._pool_total_value = 0
+        
+        # Pending debounced suggestion update (Tk after id)
+        self._search_after_id = None
+        # Set while the search box is cleared programmatically
+        self._suppress_search_trace = False
+        # Suggestions currently shown, to skip redundant Combobox updates
+        self._shown_suggestions = None
+        # Product indices behind the shown suggestions, by dropdown position
+        self._shown_suggestion_ids = ()
+        # (search type, lowercased text) of the last update, to skip repeats
+        self._last_search_key = None
+        
+        # Running direct_sku_to_json.py process, if any
+        self._process = None
+        self._command_cancelled = False
         
         # Create GUI elements
         self._create_widgets()
         
-    def _load_products(self) -> List[Dict]:
-        """Load all products from JSON templates"""
-        template_dir = Path(__file__).resolve().parent / "json_template"
-        products = []
+        # Load the catalog in the background and poll for it from the Tk loop
+        loader = ThreadPoolExecutor(max_workers=1)
+        self._loader_future = loader.submit(self._load_catalog)
+        loader.shutdown(wait=False)
+        self.root.after(50, self._poll_loader)
+        
+    def _poll_loader(self):
+        """Install the catalog once the background load has finished"""
+        if not self._loader_future.done():
+            self.root.after(50, self._poll_loader)
+            return
         
         try:
-            for json_file in template_dir.glob("*.json"):
-                try:
-                    with open(json_file, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                    
-                    for product in data.get("products", []):
-                        product_info = {
-                            "sku": product.get("产品编号", ""),
-                            "name": product.get("产品名称", ""),
-                            "description": product.get("描述", ""),
-                            "price": product.get("单价", 0),
-                            "file": json_file.stem
-                        }
-                        if product_info["sku"]:  # Only add if SKU exists
-                            products.append(product_info)
-                            
-                except Exception as e:
-                    print(f"Error reading {json_file}: {e}")
-                    
+            catalog = self._loader_future.result()
         except Exception as e:
+            self.status_var.set("Failed to load products")
             messagebox.showerror("Error", f"Failed to load products: {e}")
-            
-        return products
+            return
+        
+        self._install_catalog(*catalog)
+        # Re-run the current query, which may have been typed during loading
+        self._shown_suggestions = None
+        self._last_search_key = None
+        self._update_suggestions()
+        self.status_var.set(f"Loaded {len(self.products)} products")
+    
+    def _load_catalog(self):
+        """Load products and build their search indexes (runs on a worker thread)"""
+        products = self._load_products()
+        # Substring indexes so suggestions don't rescan the catalog per keystroke.
+        # Rebuilding them is faster than unpickling, so they are not cached.
+        name_trie = SubstringIndex([p["name_lc"] for p in products])
+        sku_trie = SubstringIndex([p["sku_lc"] for p in products])
+        return products, name_trie, sku_trie
+    
+    def _load_products(self) -> List[Dict]:
+        """Load all products from JSON templates (or the product cache)"""
+        return get_all_products(Path(__file__).resolve().parent / "json_template")
+    
+    def _install_catalog(self, products, name_trie, sku_trie):
+        """Make ``products`` and their indexes the searched catalog (Tk thread)"""
+        self.products = products
+        self.name_trie = name_trie
+        self.sku_trie = sku_trie
+        
+        # Suggestions shown for an empty query
+        self._default_suggestion_ids = tuple(range(min(20, len(products))))
+        self._default_name_suggestions = tuple(p["name_display"] for p in products[:20])
+        self._default_sku_suggestions = tuple(p["sku_display"] for p in products[:20])
+        # Recent query results; only valid for the products loaded here
+        self._suggestion_cache = OrderedDict()
     
     def _load_warehouse_options(self):
         """Load warehouse options from Storage.txt"""
@@ -231,13 +322,17 @@ class ProductSearchGUI:
         
         ttk.Button(button_frame, text="Copy to Clipboard", 
                   command=self._copy_command).pack(side=tk.LEFT, padx=(0, 10))
-        ttk.Button(button_frame, text="Execute Command", 
-                  command=self._execute_command).pack(side=tk.LEFT, padx=(0, 10))
+        self.execute_button = ttk.Button(button_frame, text="Execute Command", 
+                                         command=self._execute_command)
+        self.execute_button.pack(side=tk.LEFT, padx=(0, 10))
+        self.cancel_button = ttk.Button(button_frame, text="Cancel", 
+                                        command=self._cancel_command, state=tk.DISABLED)
+        self.cancel_button.pack(side=tk.LEFT, padx=(0, 10))
         ttk.Button(button_frame, text="Clear", 
                   command=self._clear_command).pack(side=tk.LEFT)
         
         # Status bar
-        self.status_var = tk.StringVar(value=f"Loaded {len(self.products)} products")
+        self.status_var = tk.StringVar(value="Loading products...")
         status_bar = ttk.Label(main_frame, textvariable=self.status_var, relief=tk.SUNKEN)
         status_bar.grid(row=4, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(10, 0))
         
@@ -246,49 +341,73 @@ class ProductSearchGUI:
     
     def _on_search_type_change(self):
         """Handle search type change"""
+        # Clear the search without scheduling a second, debounced update
+        self._suppress_search_trace = True
         self.search_var.set("")
+        self._suppress_search_trace = False
+        if self._search_after_id:
+            self.root.after_cancel(self._search_after_id)
         self._update_suggestions()
         
     def _on_search_change(self, *args):
-        """Handle search text change"""
-        self._update_suggestions()
+        """Handle search text change, coalescing bursts of keystrokes"""
+        if self._suppress_search_trace:
+            return
+        if self._search_after_id:
+            self.root.after_cancel(self._search_after_id)
+        self._search_after_id = self.root.after(150, self._update_suggestions)
         
     def _update_suggestions(self):
         """Update the suggestion dropdown based on search text and type"""
-        search_text = self.search_var.get().lower()
-        search_type = self.search_type.get()
+        self._search_after_id = None
+        key = (self.search_type.get(), self.search_var.get().lower())
+        if key == self._last_search_key:
+            return
+        self._last_search_key = key
+        search_type, search_text = key
         
-        if search_type == "name":
-            filtered = [p for p in self.products 
-                       if search_text in p["name"].lower()]
-            suggestions = [f"{p['name']} ({p['sku']})" for p in filtered[:20]]
-        else:  # sku
-            filtered = [p for p in self.products 
-                       if search_text in p["sku"].lower()]
-            suggestions = [f"{p['sku']} - {p['name']}" for p in filtered[:20]]
+        if not search_text:
+            ids = self._default_suggestion_ids
+            suggestions = (self._default_name_suggestions if search_type == "name"
+                           else self._default_sku_suggestions)
+        else:
+            ids, suggestions = self._compute_suggestions(search_type, search_text)
         
-        self.suggestion_combo['values'] = suggestions
+        if suggestions != self._shown_suggestions:
+            self.suggestion_combo['values'] = suggestions
+            self._shown_suggestions = suggestions
+        self._shown_suggestion_ids = ids
         if suggestions and not search_text:
             self.suggestion_combo.set('')
     
+    def _compute_suggestions(self, search_type, search_text):
+        """Return (product indices, suggestions) for a non-empty query, reusing recent results"""
+        key = (search_type, search_text)
+        cached = self._suggestion_cache.get(key)
+        if cached is not None:
+            self._suggestion_cache.move_to_end(key)
+            return cached
+        
+        if search_type == "name":
+            ids = tuple(self.name_trie.search(search_text))
+            suggestions = tuple(self.products[i]["name_display"] for i in ids)
+        else:  # sku
+            ids = tuple(self.sku_trie.search(search_text))
+            suggestions = tuple(self.products[i]["sku_display"] for i in ids)
+        
+        result = self._suggestion_cache[key] = (ids, suggestions)
+        if len(self._suggestion_cache) > SUGGESTION_CACHE_SIZE:
+            self._suggestion_cache.popitem(last=False)
+        return result
+    
     def _on_suggestion_select(self, event):
         """Handle suggestion selection"""
-        selection = self.suggestion_combo.get()
-        if not selection:
+        # Dropdown entries map by position to product indices, so the SKU
+        # never has to be parsed back out of the display string
+        position = self.suggestion_combo.current()
+        if position < 0:
             return
-            
-        # Extract SKU from selection
-        if self.search_type.get() == "name":
-            # Format: "Product Name (SKU)"
-            sku = selection.split('(')[-1].rstrip(')')
-        else:
-            # Format: "SKU - Product Name"
-            sku = selection.split(' - ')[0]
-        
-        # Find the product
-        product = next((p for p in self.products if p["sku"] == sku), None)
-        if product:
-            self._display_product(product)
+        self._display_product(self.products[self._shown_suggestion_ids[position]])
     
     def _display_product(self, product):
         """Display selected product details"""
@@ -329,7 +448,7 @@ class ProductSearchGUI:
             "warehouse": "默认仓库"  # Default warehouse for new products
         }
         
-        self._refresh_pool_display()
+        self._update_pool_row(sku)
         self.status_var.set(f"Added {quantity} × {sku} to pool")
     
     def _update_quantity(self):
@@ -352,7 +471,7 @@ class ProductSearchGUI:
             return
         
         self.product_pool[sku]["quantity"] = quantity
-        self._refresh_pool_display()
+        self._update_pool_row(sku)
         self.status_var.set(f"Updated {sku} quantity to {quantity}")
     
     def _update_warehouse(self):
@@ -431,7 +550,7 @@ class ProductSearchGUI:
             if selection:
                 new_warehouse = warehouses[selection[0]]
                 self.product_pool[sku]["warehouse"] = new_warehouse
-                self._refresh_pool_display()
+                self._update_pool_row(sku)
                 self.status_var.set(f"Updated {sku} warehouse to {new_warehouse}")
                 popup.destroy()
             else:
@@ -476,35 +595,61 @@ class ProductSearchGUI:
         
         print(f"Created warehouse mapping file: {mapping_file}")
     
+    def _pool_row_values(self, sku, item):
+        """Return (tree values, total price) for a pool entry"""
+        product = item["product"]
+        quantity = item["quantity"]
+        warehouse = item.get("warehouse", "默认仓库")  # Default if not set
+        total_price = product["price"] * quantity
+        
+        values = (
+            sku,
+            product["name"][:40] + ("..." if len(product["name"]) > 40 else ""),
+            quantity,
+            product["unit_price_str"],
+            f"¥{total_price:,.2f}",
+            warehouse
+        )
+        return values, total_price
+    
+    def _update_pool_row(self, sku):
+        """Insert, update or delete the tree row for ``sku`` to match the pool"""
+        self._pool_total_value -= self._pool_row_totals.pop(sku, 0)
+        
+        if sku in self.product_pool:
+            values, total_price = self._pool_row_values(sku, self.product_pool[sku])
+            if self.pool_tree.exists(sku):
+                self.pool_tree.item(sku, values=values)
+            else:
+                self.pool_tree.insert('', 'end', iid=sku, values=values)
+            self._pool_row_totals[sku] = total_price
+            self._pool_total_value += total_price
+        elif self.pool_tree.exists(sku):
+            self.pool_tree.delete(sku)
+        
+        self._update_pool_title()
+    
+    def _update_pool_title(self):
+        """Update frame title with count and total"""
+        pool_count = len(self.product_pool)
+        pool_frame = self.pool_tree.master
+        pool_frame.configure(text=f"Product Pool ({pool_count} items, Total: ¥{self._pool_total_value:,.2f})")
+    
     def _refresh_pool_display(self):
-        """Refresh the product pool display"""
-        # Clear existing items
-        for item in self.pool_tree.get_children():
-            self.pool_tree.delete(item)
+        """Rebuild the whole product pool display"""
+        # Clear existing items in one Tk call
+        self.pool_tree.delete(*self.pool_tree.get_children())
+        self._pool_row_totals.clear()
+        self._pool_total_value = 0
         
         # Add current pool items
-        total_value = 0
         for sku, item in self.product_pool.items():
-            product = item["product"]
-            quantity = item["quantity"]
-            warehouse = item.get("warehouse", "默认仓库")  # Default if not set
-            unit_price = product["price"]
-            total_price = unit_price * quantity
-            total_value += total_price
-            
-            self.pool_tree.insert('', 'end', values=(
-                sku,
-                product["name"][:40] + ("..." if len(product["name"]) > 40 else ""),
-                quantity,
-                f"¥{unit_price}",
-                f"¥{total_price:,.2f}",
-                warehouse
-            ))
-        
-        # Update frame title with count and total
-        pool_count = len(self.product_pool)
-        pool_frame = self.pool_tree.master
-        pool_frame.configure(text=f"Product Pool ({pool_count} items, Total: ¥{total_value:,.2f})")
+            values, total_price = self._pool_row_values(sku, item)
+            self.pool_tree.insert('', 'end', iid=sku, values=values)
+            self._pool_row_totals[sku] = total_price
+            self._pool_total_value += total_price
+        
+        self._update_pool_title()
     
     def _remove_from_pool(self):
         """Remove selected item from pool"""
@@ -513,14 +658,13 @@ class ProductSearchGUI:
             messagebox.showwarning("Warning", "Please select an item to remove")
             return
             
-        # Get SKU from selected item
-        item = self.pool_tree.item(selection[0])
-        sku = item['values'][0]
+        # Rows are keyed by SKU
+        sku = selection[0]
         
         # Remove from pool
         if sku in self.product_pool:
             del self.product_pool[sku]
-            self._refresh_pool_display()
+            self._update_pool_row(sku)
             self.status_var.set(f"Removed {sku} from pool")
     
     def _clear_pool(self):
@@ -546,8 +690,9 @@ class ProductSearchGUI:
         if not order_name:
             order_name = "factory"
         
-        # Build command with all SKU-quantity pairs
-        command_parts = ["python", "direct_sku_to_json.py", "--name", order_name]
+        # Build command with all SKU-quantity pairs; the interpreter running
+        # the GUI has the dependencies, so it is the one shown and executed
+        command_parts = [sys.executable, "direct_sku_to_json.py", "--name", order_name]
         
         # Add PO import flag if checked
         if self.po_import_var.get():
@@ -569,7 +714,12 @@ class ProductSearchGUI:
             command_parts.extend([sku, str(quantity)])
             product_details.append(f"- {sku}: {quantity} × ¥{unit_price} = ¥{total_price:,.2f} ({product['name']}) [仓库: {warehouse}]")
         
-        command = " ".join(command_parts)
+        # Quoted for the platform's shell for display/clipboard; the list
+        # itself is what gets executed
+        if os.name == "nt":
+            command = subprocess.list2cmdline(command_parts)
+        else:
+            command = shlex.join(command_parts)
         
         # Display command with details
         details = f"""Command to generate order for {len(self.product_pool)} products:
@@ -606,13 +756,13 @@ This command will:
         
         # Store command for copying/execution
         self.current_command = command
+        self.current_command_list = command_parts
         
         total_items = sum(item['quantity'] for item in self.product_pool.values())
         self.status_var.set(f"Generated command for {len(self.product_pool)} products ({total_items} total items)")
     
     def _get_current_date(self):
         """Get current date in Chinese format"""
-        from datetime import datetime
         return datetime.now().strftime('%Y年%m月%d日')
     
     def _copy_command(self):
@@ -632,39 +782,92 @@ This command will:
             messagebox.showwarning("Warning", "No command to execute")
             return
             
+        if self._process is not None:
+            return
+        
+        # Run from the script directory; output is streamed into the command
+        # display by a worker thread as it is produced
+        script_dir = Path(__file__).resolve().parent
         try:
-            # Change to the script directory
-            script_dir = Path(__file__).resolve().parent
-            
-            # Execute command
-            result = subprocess.run(
-                self.current_command.split(),
+            self._process = subprocess.Popen(
+                self.current_command_list,
                 cwd=script_dir,
-                capture_output=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
                 text=True,
-                check=True
+                errors="replace",
+                bufsize=1
             )
-            
-            # Show success message with output
-            success_msg = f"Command executed successfully!\n\nOutput:\n{result.stdout}"
-            if result.stderr:
-                success_msg += f"\n\nWarnings:\n{result.stderr}"
-                
-            messagebox.showinfo("Success", success_msg)
-            self.status_var.set("Command executed successfully")
-            
-        except subprocess.CalledProcessError as e:
-            error_msg = f"Command failed with exit code {e.returncode}\n\nError:\n{e.stderr}\n\nOutput:\n{e.stdout}"
-            messagebox.showerror("Execution Error", error_msg)
-            
         except Exception as e:
             messagebox.showerror("Error", f"Failed to execute command: {e}")
+            return
+        
+        self._command_cancelled = False
+        self.execute_button.config(state=tk.DISABLED)
+        self.cancel_button.config(state=tk.NORMAL)
+        self.command_text.insert(tk.END, "\nOutput:\n")
+        self.status_var.set("Executing command...")
+        threading.Thread(target=self._read_output, args=(self._process,), daemon=True).start()
+    
+    def _read_output(self, process):
+        """Stream the output of ``process`` to the display (worker thread)"""
+        returncode = None
+        try:
+            for line in process.stdout:
+                self.root.after(0, self._append_output, line)
+            returncode = process.wait()
+        except Exception as e:
+            self.root.after(0, self._append_output, f"\n[Error reading output: {e}]\n")
+        finally:
+            if returncode is None and process.poll() is None:
+                # The output can no longer be followed, so Cancel could not
+                # stop the process once the UI is reset; stop it here
+                process.kill()
+                process.wait()
+            # Always reset the UI, even when reading the output failed
+            self.root.after(0, self._on_command_finished, returncode)
+    
+    def _cancel_command(self):
+        """Terminate the running command"""
+        if self._process is not None:
+            self._command_cancelled = True
+            try:
+                self._process.terminate()
+            except OSError:
+                pass  # Already exited; the reader thread resets the UI
+            self.status_var.set("Cancelling command...")
+    
+    def _append_output(self, line):
+        """Append a line of command output to the display"""
+        self.command_text.insert(tk.END, line)
+        self.command_text.see(tk.END)
+    
+    def _on_command_finished(self, returncode):
+        """Report the result of an executed command"""
+        self._process = None
+        self.execute_button.config(state=tk.NORMAL)
+        self.cancel_button.config(state=tk.DISABLED)
+        
+        if self._command_cancelled:
+            self._append_output("\n[Cancelled]\n")
+            self.status_var.set("Command cancelled")
+        elif returncode is None:
+            messagebox.showerror("Execution Error", "Could not read the command output.\n\nSee the output below the command.")
+            self.status_var.set("Command output could not be read")
+        elif returncode == 0:
+            messagebox.showinfo("Success", "Command executed successfully!\n\nSee the output below the command.")
+            self.status_var.set("Command executed successfully")
+        else:
+            messagebox.showerror("Execution Error",
+                                 f"Command failed with exit code {returncode}\n\nSee the output below the command.")
+            self.status_var.set(f"Command failed (exit code {returncode})")
     
     def _clear_command(self):
         """Clear the command display"""
         self.command_text.delete(1.0, tk.END)
         if hasattr(self, 'current_command'):
             delattr(self, 'current_command')
+            delattr(self, 'current_command_list')
         self.status_var.set("Command cleared")
 
 
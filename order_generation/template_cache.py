@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Shared loading of the JSON product templates in json_template/
+
+Scripts that need template contents or the product list read them through
+this module, so parsing lives in one place:
+
+- loads_json() / dumps_json() parse and serialize template JSON, using
+  orjson when installed
+- read_template() parses one template file
+- get_all_products() returns the product list used by the search GUI; it is
+  memoized per process and pickled next to the templates, keyed by a
+  manifest of every template's name, mtime and size
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+try:
+    import orjson
+except ImportError:  # optional: fall back to json
+    orjson = None
+
+TEMPLATE_DIR = Path(__file__).resolve().parent / "json_template"
+
+# Pickled product list, stored next to the templates
+PRODUCT_CACHE_NAME = ".product_cache.pkl"
+# Bump when the fields built by _parse_products or the signature change
+PRODUCT_CACHE_VERSION = 4
+
+# (version, blake2b digest of the sorted (name, mtime_ns, size) of every template)
+Signature = Tuple[int, bytes]
+
+# template dir -> (signature, products) for the current process
+_PRODUCTS: Dict[Path, Tuple[Signature, List[Dict]]] = {}
+
+
+def loads_json(raw: bytes) -> Any:
+    """Parse JSON ``raw`` bytes, using orjson when available"""
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+def dumps_json(obj: Any) -> bytes:
+    """Serialize ``obj`` as indented UTF-8 JSON, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def read_template(json_file: Path) -> Dict:
+    """Parse one JSON template and return a fresh dict"""
+    return loads_json(json_file.read_bytes())
+
+
+def _read_template_or_error(json_file: Path):
+    """Parse one JSON template, returning the exception instead of raising it"""
+    try:
+        return read_template(json_file)
+    except Exception as e:
+        return e
+
+
+def _read_product_cache(cache_path: Path, signature: Signature):
+    """Return the cached product list if ``signature`` matches, else None"""
+    try:
+        with open(cache_path, 'rb') as f:
+            if pickle.load(f) == signature:
+                return pickle.load(f)
+    except Exception:
+        pass
+    return None
+
+
+def _write_product_cache(cache_path: Path, signature: Signature, payload) -> None:
+    """Atomically write ``payload`` to the product cache under ``signature``"""
+    tmp_name = None
+    try:
+        with tempfile.NamedTemporaryFile(dir=cache_path.parent, suffix=".tmp", delete=False) as f:
+            tmp_name = f.name
+            pickle.dump(signature, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_name, cache_path)
+    except Exception as e:
+        print(f"Could not write product cache: {e}")
+        if tmp_name and os.path.exists(tmp_name):
+            os.remove(tmp_name)
+
+
+def _parse_products(json_files: List[Path]) -> List[Dict]:
+    """Parse product entries from the given JSON template files"""
+    products = []
+
+    # Overlap file reads and parsing across threads
+    with ThreadPoolExecutor(max_workers=min(16, len(json_files) or 1)) as executor:
+        templates = list(executor.map(_read_template_or_error, json_files))
+
+    for json_file, data in zip(json_files, templates):
+        try:
+            if isinstance(data, Exception):
+                raise data
+
+            for product in data.get("products", []):
+                product_info = {
+                    "sku": product.get("产品编号", ""),
+                    "name": product.get("产品名称", ""),
+                    "description": product.get("描述", ""),
+                    "price": product.get("单价", 0),
+                    "file": json_file.stem
+                }
+                product_info["name_lc"] = product_info["name"].lower()
+                product_info["sku_lc"] = product_info["sku"].lower()
+                # Suggestion strings, formatted once instead of per keystroke
+                product_info["name_display"] = f'{product_info["name"]} ({product_info["sku"]})'
+                product_info["sku_display"] = f'{product_info["sku"]} - {product_info["name"]}'
+                product_info["unit_price_str"] = f'¥{product_info["price"]}'
+                if product_info["sku"]:  # Only add if SKU exists
+                    products.append(product_info)
+
+        except Exception as e:
+            print(f"Error reading {json_file}: {e}")
+
+    return products
+
+
+def get_all_products(template_dir: Path = TEMPLATE_DIR) -> List[Dict]:
+    """Return the products of all templates in ``template_dir``.
+
+    The list is shared between callers in a process and must not be mutated."""
+    with os.scandir(template_dir) as entries:
+        json_entries = [e for e in entries if e.name.endswith(".json") and e.is_file()]
+    # Any added, removed, renamed, edited or replaced template invalidates the caches
+    manifest = []
+    for entry in json_entries:
+        st = entry.stat()
+        manifest.append((entry.name, st.st_mtime_ns, st.st_size))
+    digest = hashlib.blake2b(repr(sorted(manifest)).encode("utf-8")).digest()
+    signature = (PRODUCT_CACHE_VERSION, digest)
+
+    memo = _PRODUCTS.get(template_dir)
+    if memo is not None and memo[0] == signature:
+        return memo[1]
+
+    cache_path = template_dir / PRODUCT_CACHE_NAME
+    products = _read_product_cache(cache_path, signature)
+    if products is None:
+        products = _parse_products([Path(e.path) for e in json_entries])
+        _write_product_cache(cache_path, signature, products)
+    _PRODUCTS[template_dir] = (signature, products)
+    return products
@@ -1,6 +1,7 @@
 import openpyxl
 import os
 import shutil
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 
 def restore_excel_formatting(original_file, modified_file, output_file):
@@ -11,21 +12,24 @@ def restore_excel_formatting(original_file, modified_file, output_file):
         # Load the original file (with formatting)
         original_wb = openpyxl.load_workbook(original_file)
         
-        # Load the modified file (with updated data but no formatting)
-        modified_wb = openpyxl.load_workbook(modified_file, data_only=True)
+        # Load the modified file (with updated data but no formatting).
+        # Only its values are needed, so stream it without building Cell objects.
+        modified_wb = openpyxl.load_workbook(modified_file, data_only=True, read_only=True)
         
-        # Process each worksheet
-        for sheet_name in modified_wb.sheetnames:
-            if sheet_name in original_wb.sheetnames:
-                original_ws = original_wb[sheet_name]
-                modified_ws = modified_wb[sheet_name]
-                
-                # Copy values from modified sheet to original sheet (preserving formatting)
-                for row in modified_ws.iter_rows():
-                    for cell in row:
-                        if cell.value is not None:
-                            original_cell = original_ws.cell(row=cell.row, column=cell.column)
-                            original_cell.value = cell.value
+        try:
+            # Process each worksheet
+            for sheet_name in modified_wb.sheetnames:
+                if sheet_name in original_wb.sheetnames:
+                    original_ws = original_wb[sheet_name]
+                    modified_ws = modified_wb[sheet_name]
+                    
+                    # Copy values from modified sheet to original sheet (preserving formatting)
+                    for r_idx, row in enumerate(modified_ws.iter_rows(values_only=True), start=1):
+                        for c_idx, value in enumerate(row, start=1):
+                            if value is not None:
+                                original_ws.cell(row=r_idx, column=c_idx).value = value
+        finally:
+            modified_wb.close()
         
         # Save the result
         original_wb.save(output_file)
@@ -36,6 +40,15 @@ def restore_excel_formatting(original_file, modified_file, output_file):
         print(f"Error processing {os.path.basename(modified_file)}: {str(e)}")
         return False
 
+def _restore_one(task):
+    """Run restore_excel_formatting for one (original, modified, output) tuple"""
+    return restore_excel_formatting(*task)
+
+def _copy_one(task):
+    """Copy one (src, dst) file pair, keeping metadata"""
+    shutil.copy2(*task)
+    return os.path.basename(task[1])
+
 def main():
     # Define paths
     original_dir = r"c:\Users\Cheng\Desktop\amazon_order\order_generation\PO_excel"
@@ -81,28 +94,34 @@ def main():
     successful = 0
     failed = 0
     
+    tasks = []
     for filename in problem_files:
         original_file = os.path.join(original_dir, filename)
         modified_file = os.path.join(modified_dir, filename)
         output_file = os.path.join(output_dir, filename)
         
         if os.path.exists(original_file) and os.path.exists(modified_file):
-            if restore_excel_formatting(original_file, modified_file, output_file):
-                successful += 1
-            else:
-                failed += 1
+            tasks.append((original_file, modified_file, output_file))
         else:
             print(f"Missing files for {filename}")
             failed += 1
     
+    # Each file is an independent, CPU-bound openpyxl load/save, so restore
+    # them in parallel across processes
+    with ProcessPoolExecutor() as executor:
+        for ok in executor.map(_restore_one, tasks):
+            if ok:
+                successful += 1
+            else:
+                failed += 1
+    
     # Copy files that didn't need restoration
     print("\nCopying files that retained formatting...")
-    all_files = os.listdir(modified_dir)
-    for filename in all_files:
-        if filename.endswith('.xlsx') and filename not in problem_files:
-            src = os.path.join(modified_dir, filename)
-            dst = os.path.join(output_dir, filename)
-            shutil.copy2(src, dst)
+    copies = [(os.path.join(modified_dir, filename), os.path.join(output_dir, filename))
+              for filename in os.listdir(modified_dir)
+              if filename.endswith('.xlsx') and filename not in problem_files]
+    with ThreadPoolExecutor() as executor:
+        for filename in executor.map(_copy_one, copies):
             print(f"Copied {filename}")
     
     print("=" * 50)
@@ -13,6 +13,7 @@ Supported Applications:
 
 Usage:
     python setup_dependencies.py
+    python setup_dependencies.py --yes --no-optional   # unattended (e.g. CI)
     
 Features:
 - Automatic dependency detection and installation
@@ -23,24 +24,54 @@ Features:
 - Cross-platform support (Windows/macOS/Linux)
 """
 
+import argparse
 import sys
 import subprocess
 import importlib
+import importlib.util
 import platform
 import os
+import shutil
 from pathlib import Path
 from typing import List, Dict, Tuple, Optional
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from importlib import metadata as importlib_metadata
+except ImportError:  # Python 3.7: fall back to importing the package
+    importlib_metadata = None
+
+
+# pip invocation shared by all installs: no self-update check, never prompt,
+# and take wheels over source builds when both exist
+PIP_INSTALL = [sys.executable, "-m", "pip", "install",
+               "--disable-pip-version-check", "--no-input", "--prefer-binary"]
 
 
 class DependencyManager:
-    def __init__(self):
+    def __init__(self, assume_yes: bool = False, skip_optional: bool = False, skip_venv: bool = False,
+                 force: bool = False):
         self.python_version = sys.version_info
         self.platform = platform.system()
         self.installation_log = []
+        # Formatted "%H:%M:%S" prefix for the current second
+        self._log_second = None
+        self._log_timestamp = ""
         self.failed_packages = []
         self.success_packages = []
+        # Unattended runs (--yes, no terminal, or AMAZON_SETUP_YES=1) take the
+        # default answer for every prompt instead of waiting on stdin
+        self.auto = (assume_yes or not sys.stdin.isatty()
+                     or os.environ.get("AMAZON_SETUP_YES") == "1")
+        self.skip_optional = skip_optional
+        self.skip_venv = skip_venv
+        # Run the full setup even when nothing is missing
+        self.force = force
+        # Positive probe results; installed packages don't disappear during setup,
+        # so the verify pass only re-probes what was missing
+        self._probe_cache: Dict[str, Tuple[bool, Optional[str]]] = {}
         
         # Define required packages with versions and alternatives
         self.required_packages = {
@@ -49,19 +80,23 @@ class DependencyManager:
                 "version": ">=1.8.0",
                 "description": "Clipboard functionality for product search GUI",
                 "required_by": ["product_search_gui.py"],
-                "install_name": "pyperclip"
+                "install_name": "pyperclip",
+                "dist_name": "pyperclip"
             },
             "openpyxl": {
                 "version": ">=3.0.0",
                 "description": "Excel file processing for multiple scripts",
                 "required_by": ["accessory_mapping_updater_gui.py", "json_PO_excel.py", "excel_to_json_template.py"],
-                "install_name": "openpyxl"
+                "install_name": "openpyxl",
+                "dist_name": "openpyxl"
             },
             "pillow": {
                 "version": ">=8.0.0",
                 "description": "Image processing for Excel files and product images",
                 "required_by": ["json_PO_excel.py"],
-                "install_name": "pillow"
+                "install_name": "pillow",
+                "dist_name": "Pillow",
+                "import_name": "PIL"
             },
             
             # Standard library packages (usually included)
@@ -159,13 +194,33 @@ class DependencyManager:
                 "version": ">=3.0.0", 
                 "description": "Advanced Excel writing capabilities",
                 "benefit": "Enhanced Excel output formatting"
+            },
+            "orjson": {
+                "version": ">=3.0.0",
+                "description": "Fast JSON parsing and writing",
+                "benefit": "Faster template loading and rewriting (used automatically when installed)"
             }
         }
     
+    def ask(self, question: str, default: bool) -> bool:
+        """Ask a yes/no question, returning ``default`` when running unattended"""
+        hint = "(Y/n)" if default else "(y/N)"
+        if self.auto:
+            self.log(f"{question} {hint}: {'yes' if default else 'no'} (non-interactive)")
+            return default
+        
+        choice = input(f"{question} {hint}: ").strip().lower()
+        if default:
+            return choice not in ['n', 'no']
+        return choice in ['y', 'yes']
+    
     def log(self, message: str, level: str = "INFO"):
         """Log a message with timestamp"""
-        timestamp = time.strftime("%H:%M:%S")
-        log_entry = f"[{timestamp}] {level}: {message}"
+        now = int(time.time())
+        if now != self._log_second:
+            self._log_second = now
+            self._log_timestamp = time.strftime("%H:%M:%S", time.localtime(now))
+        log_entry = f"[{self._log_timestamp}] {level}: {message}"
         print(log_entry)
         self.installation_log.append(log_entry)
     
@@ -185,23 +240,28 @@ class DependencyManager:
     
     def check_package_installed(self, package_name: str) -> Tuple[bool, Optional[str]]:
         """Check if a package is installed and return version"""
+        info = self.required_packages.get(package_name, {})
         try:
             # Handle special cases
             if package_name == "tkinter":
-                if self.platform == "Windows":
-                    import tkinter
-                else:
-                    import tkinter
+                # Only an import proves the compiled _tkinter extension is present
+                import tkinter
                 return True, "builtin"
-            elif "." in package_name:
-                # Handle nested imports like xml.etree.ElementTree
-                module = importlib.import_module(package_name)
+            elif info.get("dist_name") and importlib_metadata is not None:
+                # Read the installed version without importing the package
+                return True, importlib_metadata.version(info["dist_name"])
+            elif info.get("install_name") is None:
+                # Built-in modules (including nested ones like xml.etree.ElementTree)
+                # only need to be locatable
+                if importlib.util.find_spec(package_name) is None:
+                    return False, None
                 return True, "builtin"
             else:
-                module = importlib.import_module(package_name)
+                module = importlib.import_module(info.get("import_name", package_name))
                 version = getattr(module, '__version__', 'unknown')
                 return True, version
         except ImportError:
+            # Also covers importlib.metadata.PackageNotFoundError
             return False, None
     
     def install_package(self, package_name: str, install_name: str = None) -> bool:
@@ -213,8 +273,9 @@ class DependencyManager:
         
         try:
             # Use the same Python executable that's running this script
-            cmd = [sys.executable, "-m", "pip", "install", install_name]
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+            cmd = PIP_INSTALL + [install_name]
+            subprocess.run(cmd, capture_output=True, text=True, check=True,
+                           env={**os.environ, "PIP_NO_INPUT": "1"})
             
             self.log(f"✓ Successfully installed {install_name}")
             self.success_packages.append(install_name)
@@ -229,6 +290,30 @@ class DependencyManager:
             self.failed_packages.append(install_name)
             return False
     
+    def install_packages_batch(self, install_names: List[str]) -> bool:
+        """Install several packages with a single pip run, falling back to one at a time"""
+        if len(install_names) == 1:
+            return self.install_package(install_names[0])
+            
+        self.log(f"Installing {', '.join(install_names)}...")
+        
+        try:
+            # One pip process resolves and installs everything together
+            cmd = PIP_INSTALL + install_names
+            subprocess.run(cmd, capture_output=True, text=True, check=True,
+                           env={**os.environ, "PIP_NO_INPUT": "1"})
+        except Exception as e:
+            details = e.stderr if isinstance(e, subprocess.CalledProcessError) else e
+            self.log(f"Batch install failed, retrying packages individually: {details}", "WARNING")
+            # Install each package on its own so one failure doesn't block the rest
+            results = [self.install_package(name) for name in install_names]
+            return all(results)
+        
+        for name in install_names:
+            self.log(f"✓ Successfully installed {name}")
+            self.success_packages.append(name)
+        return True
+    
     def install_linux_package(self, package_name: str) -> bool:
         """Install system package on Linux (for tkinter)"""
         if self.platform != "Linux":
@@ -236,7 +321,7 @@ class DependencyManager:
             
         self.log(f"Attempting to install system package: {package_name}")
         
-        # Try different package managers
+        # Try different package managers, running only those present on PATH
         managers = [
             ["sudo", "apt-get", "install", "-y", package_name],  # Debian/Ubuntu
             ["sudo", "yum", "install", "-y", package_name],     # RHEL/CentOS
@@ -245,6 +330,8 @@ class DependencyManager:
         ]
         
         for cmd in managers:
+            if shutil.which(cmd[1]) is None:
+                continue
             try:
                 result = subprocess.run(cmd, capture_output=True, text=True, check=True)
                 self.log(f"✓ Successfully installed {package_name} via {cmd[1]}")
@@ -260,8 +347,22 @@ class DependencyManager:
         self.log("Checking all dependencies...")
         results = {}
         
-        for package, info in self.required_packages.items():
-            installed, version = self.check_package_installed(package)
+        # Probes are dominated by filesystem lookups, so run the uncached ones
+        # concurrently and log afterwards in the original order
+        to_probe = [pkg for pkg in self.required_packages if pkg not in self._probe_cache]
+        if to_probe:
+            with ThreadPoolExecutor(max_workers=min(8, len(to_probe))) as executor:
+                probed = dict(zip(to_probe, executor.map(self.check_package_installed, to_probe)))
+        else:
+            probed = {}
+        
+        for package in self.required_packages:
+            if package in probed:
+                installed, version = probed[package]
+                if installed:
+                    self._probe_cache[package] = (installed, version)
+            else:
+                installed, version = self._probe_cache[package]
             status = "✓ Installed" if installed else "✗ Missing"
             version_info = f" (v{version})" if version and version != "builtin" else ""
             
@@ -280,6 +381,7 @@ class DependencyManager:
         
         self.log(f"Found {len(missing_packages)} missing dependencies")
         success = True
+        pip_packages = []
         
         for package in missing_packages:
             info = self.required_packages[package]
@@ -296,13 +398,19 @@ class DependencyManager:
                 else:
                     self.log(f"Skipping {package} (should be built-in)")
             else:
-                if not self.install_package(package, install_name):
-                    success = False
+                pip_packages.append(install_name)
+        
+        if pip_packages and not self.install_packages_batch(pip_packages):
+            success = False
         
         return success
     
     def install_optional_packages(self) -> None:
         """Install optional packages with user consent"""
+        if self.skip_optional:
+            self.log("Skipping optional packages")
+            return
+            
         self.log("\nOptional packages available:")
         
         for package, info in self.optional_packages.items():
@@ -310,8 +418,7 @@ class DependencyManager:
             print(f"Benefit: {info['benefit']}")
             
             try:
-                choice = input(f"Install {package}? (y/N): ").strip().lower()
-                if choice in ['y', 'yes']:
+                if self.ask(f"Install {package}?", default=False):
                     self.install_package(package)
             except KeyboardInterrupt:
                 self.log("\nSkipping optional packages...")
@@ -378,8 +485,7 @@ class DependencyManager:
         
         try:
             with open(log_file, 'w', encoding='utf-8') as f:
-                for entry in self.installation_log:
-                    f.write(entry + "\n")
+                f.writelines(entry + "\n" for entry in self.installation_log)
             
             self.log(f"Installation log saved to: {log_file}")
         except Exception as e:
@@ -387,9 +493,12 @@ class DependencyManager:
     
     def setup_virtual_environment(self) -> bool:
         """Optionally create and activate virtual environment"""
+        if self.skip_venv:
+            return True
+            
         try:
-            choice = input("\nCreate virtual environment for this project? (y/N): ").strip().lower()
-            if choice not in ['y', 'yes']:
+            print()
+            if not self.ask("Create virtual environment for this project?", default=False):
                 return True
             
             venv_path = Path(__file__).parent / "venv"
@@ -422,13 +531,20 @@ class DependencyManager:
         if not self.check_python_version():
             return False
         
+        # Check current dependency status
+        check_results = self.check_all_dependencies()
+        
+        # Nothing missing: skip the prompts, installs and verify pass
+        if not self.force and all(installed for installed, _ in check_results.values()):
+            self.log(f"✓ All {len(check_results)} required dependencies are present "
+                     "(use --force to run the full setup)")
+            self.save_log()
+            return True
+        
         # Optional virtual environment setup
         if not self.setup_virtual_environment():
             return False
         
-        # Check current dependency status
-        check_results = self.check_all_dependencies()
-        
         # Install missing dependencies
         if not self.install_missing_dependencies(check_results):
             self.log("Some required dependencies failed to install", "WARNING")
@@ -460,8 +576,23 @@ class DependencyManager:
             return False
 
 
-def main():
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Check and install the dependencies of the Amazon Order Generation system")
+    parser.add_argument("--yes", "-y", action="store_true",
+                        help="Don't prompt; take the default answer for every question (also AMAZON_SETUP_YES=1)")
+    parser.add_argument("--no-optional", action="store_true", help="Don't offer optional packages")
+    parser.add_argument("--no-venv", action="store_true", help="Don't offer to create a virtual environment")
+    parser.add_argument("--force", action="store_true",
+                        help="Run the full setup even if all required dependencies are installed")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
     """Main function"""
+    args = parse_args(argv)
+    manager = DependencyManager(assume_yes=args.yes, skip_optional=args.no_optional,
+                                skip_venv=args.no_venv, force=args.force)
+    
     print("Amazon Order Generation - Dependency Setup")
     print("=" * 50)
     print("This script will check and install all required dependencies.")
@@ -472,15 +603,13 @@ def main():
     print()
     
     try:
-        choice = input("Continue with dependency setup? (Y/n): ").strip().lower()
-        if choice in ['n', 'no']:
+        if not manager.ask("Continue with dependency setup?", default=True):
             print("Setup cancelled.")
             return
     except KeyboardInterrupt:
         print("\nSetup cancelled.")
         return
     
-    manager = DependencyManager()
     success = manager.run_setup()
     
     if success:
@@ -1,64 +1,122 @@
 import json
 import os
-import glob
 import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# Share the template JSON helpers with the order_generation scripts
+sys.path.insert(0, str(Path(__file__).resolve().parent / "order_generation"))
+from template_cache import dumps_json, loads_json
+
+# Suppliers whose name contains this get a 7 day delivery time
+PRINT_SHOP_MARKER = '印刷厂'
+# Suppliers with a 45 day delivery time; everyone else gets 15
+SUPPLIERS_45_DAYS = frozenset({
+    '宁波泰丰机械有限公司',
+    '阳江骏业工贸有限公司',
+    '宁波瑾秀制刷科技有限公司',
+    '宁波市海曙硕丰塑料五金制品有限公司',
+})
+
+# String value of a flat cell object such as "B14": {"key": "...", "value": "..."}
+# (group 1 is the raw JSON string contents)
+B3_VALUE_RE = re.compile(rb'"B3"\s*:\s*\{[^{}]*?"value"\s*:\s*"((?:[^"\\]|\\.)*)"')
+B14_VALUE_RE = re.compile(rb'"B14"\s*:\s*\{[^{}]*?"value"\s*:\s*"((?:[^"\\]|\\.)*)"')
+
+def delivery_days_for(supplier_value):
+    """Return the delivery time in days for a supplier name."""
+    if PRINT_SHOP_MARKER in supplier_value:
+        return 7
+    elif supplier_value in SUPPLIERS_45_DAYS:
+        return 45
+    return 15  # default
+
+def _update_in_place(json_file_path):
+    """Rewrite just the B14 value bytes, returning (supplier, days, changed).
+    
+    Returns None when B3/B14 can't be located unambiguously as string values;
+    the caller then falls back to a full JSON parse."""
+    with open(json_file_path, 'rb') as f:
+        raw = f.read()
+    
+    b3 = list(B3_VALUE_RE.finditer(raw))
+    b14 = list(B14_VALUE_RE.finditer(raw))
+    if len(b3) != 1 or len(b14) != 1:
+        return None
+    
+    supplier_value = json.loads(b'"' + b3[0].group(1) + b'"')
+    new_days = delivery_days_for(supplier_value)
+    
+    new_value = str(new_days).encode('ascii')
+    changed = b14[0].group(1) != new_value
+    if changed:
+        start, end = b14[0].span(1)
+        with open(json_file_path, 'wb') as f:
+            f.write(raw[:start] + new_value + raw[end:])
+    return supplier_value, new_days, changed
 
 def update_delivery_time(json_file_path):
-    """Update delivery time in a JSON file based on supplier name."""
+    """Update delivery time in a JSON file based on supplier name.
+    
+    Returns (status, message) so callers running in worker processes can
+    report results in order; status is "updated", "unchanged" or "failed".
+    Files already holding the right value are not rewritten."""
     try:
-        with open(json_file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        # Get supplier name
-        supplier_value = data.get('cells', {}).get('B3', {}).get('value', '')
-        
-        # Get current delivery time
-        current_delivery = data.get('cells', {}).get('B14', {}).get('value', '')
-        
-        # Determine new delivery time based on supplier
-        new_days = 15  # default
-        
-        if '印刷厂' in supplier_value:
-            new_days = 7
-        elif supplier_value in [
-            '宁波泰丰机械有限公司',
-            '阳江骏业工贸有限公司', 
-            '宁波瑾秀制刷科技有限公司',
-            '宁波市海曙硕丰塑料五金制品有限公司'
-        ]:
-            new_days = 45
-        
-        # Update the delivery time value with just the number
-        if 'B14' in data.get('cells', {}):
-            data['cells']['B14']['value'] = str(new_days)
+        # Fast path: patch the B14 value without decoding the whole template
+        result = _update_in_place(json_file_path)
+        if result is not None:
+            supplier_value, new_days, changed = result
+        else:
+            with open(json_file_path, 'rb') as f:
+                raw = f.read()
+            data = loads_json(raw)
             
-            # Save the updated file
-            with open(json_file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            cells = data.get('cells') or {}
             
-            print(f"Updated {os.path.basename(json_file_path)}: Supplier: {supplier_value} -> Delivery time: {new_days} days")
-            return True
-        else:
-            print(f"No B14 cell found in {os.path.basename(json_file_path)}")
-            return False
+            # Get supplier name
+            supplier_value = (cells.get('B3') or {}).get('value', '')
+            
+            # Determine new delivery time based on supplier
+            new_days = delivery_days_for(supplier_value)
+            
+            b14 = cells.get('B14')
+            if b14 is None:
+                return "failed", f"No B14 cell found in {os.path.basename(json_file_path)}"
+            
+            # Update the delivery time value with just the number
+            changed = str(b14.get('value', '')).strip() != str(new_days)
+            if changed:
+                b14['value'] = str(new_days)
+                
+                # Save the updated file
+                with open(json_file_path, 'wb') as f:
+                    f.write(dumps_json(data))
+        
+        status = "updated" if changed else "unchanged"
+        return status, f"{status.capitalize()} {os.path.basename(json_file_path)}: Supplier: {supplier_value} -> Delivery time: {new_days} days"
             
     except Exception as e:
-        print(f"Error processing {json_file_path}: {e}")
-        return False
+        return "failed", f"Error processing {json_file_path}: {e}"
 
 def main():
     # Get all JSON files in the json_template directory
-    json_pattern = r"c:\Users\Cheng\Desktop\amazon_order\order_generation\json_template\*.json"
-    json_files = glob.glob(json_pattern)
+    json_dir = r"c:\Users\Cheng\Desktop\amazon_order\order_generation\json_template"
+    with os.scandir(json_dir) as entries:
+        json_files = [entry.path for entry in entries
+                      if entry.name.endswith('.json') and entry.is_file()]
     
     print(f"Found {len(json_files)} JSON files to process...")
     
-    updated_count = 0
-    for json_file in json_files:
-        if update_delivery_time(json_file):
-            updated_count += 1
+    # Files are independent, so spread them across processes
+    counts = {"updated": 0, "unchanged": 0, "failed": 0}
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        for status, message in executor.map(update_delivery_time, json_files, chunksize=32):
+            print(message)
+            counts[status] += 1
     
-    print(f"\nCompleted! Updated {updated_count} out of {len(json_files)} files.")
+    print(f"\nCompleted! Updated {counts['updated']}, unchanged {counts['unchanged']}, "
+          f"failed {counts['failed']} out of {len(json_files)} files.")
 
 if __name__ == "__main__":
     main()